@@ -1,15 +1,32 @@
-from poetry.console.application import Application
+from typing import TYPE_CHECKING
+
 from poetry.plugins.application_plugin import ApplicationPlugin
 
-from poetry_relax.command import RelaxCommand
+if TYPE_CHECKING:
+    from poetry.console.application import Application
+
+    from poetry_relax.command import RelaxCommand
 
 # Plugin registration with Poetry
 
 
-def _command_factory() -> RelaxCommand:
+def _command_factory() -> "RelaxCommand":
+    # Imported lazily so the command module — which pulls in Poetry's console and
+    # installer machinery — is only loaded if `poetry relax` is actually invoked
+    from poetry_relax.command import RelaxCommand
+
     return RelaxCommand()
 
 
 class RelaxPlugin(ApplicationPlugin):
-    def activate(self, application: Application):
+    def activate(self, application: "Application"):
         application.command_loader.register_factory("relax", _command_factory)
+
+
+def __getattr__(name: str):
+    # Lazy re-export so importing the package during plugin discovery stays cheap
+    if name == "RelaxCommand":
+        from poetry_relax.command import RelaxCommand
+
+        return RelaxCommand
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
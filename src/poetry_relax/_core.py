@@ -63,7 +63,13 @@ else:
 AND_CONSTRAINT_SEPARATORS = re.compile(
     r"((?<!^)(?<![~=>< ,]) *(?<!-)[, ](?!-) *(?!,|$))"
 )
-OR_CONSTRAINT_SEPARATORS = re.compile(r"(\s*\|\|?\s*)")
+
+# Combined alternation of the _or_ and _and_ separators allowing constraint strings
+# to be walked in a single pass; the _or_ alternative is listed first so it takes
+# priority where both could match
+CONSTRAINT_SEPARATORS = re.compile(
+    r"(?P<or>\s*\|\|?\s*)|(?P<and>(?<!^)(?<![~=>< ,]) *(?<!-)[, ](?!-) *(?!,|$))"
+)
 
 
 @contextlib.contextmanager
@@ -103,20 +109,18 @@ def run_installer_update(
 
     New dependencies are also whitelisted to be updated during locking.
     """
-    all_dependencies = []
+    # Collect the names for the whitelist during the first pass so generators are
+    # only consumed once and no intermediate list of dependencies is retained
+    dependency_names = []
 
     for group_name, dependencies in dependencies_by_group.items():
         group = poetry.package.dependency_group(group_name)
 
-        # Ensure if we are given a generator that we can consume it more than once
-        dependencies = list(dependencies)
-
         for dependency in dependencies:
             with contextlib.suppress(ValueError):
                 group.remove_dependency(dependency.name)
             group.add_dependency(dependency)
-
-        all_dependencies.extend(dependencies)
+            dependency_names.append(dependency.name)
 
     # Refresh the locker
     poetry.set_locker(poetry.locker.__class__(poetry.locker.lock, poetry_config))
@@ -130,7 +134,7 @@ def run_installer_update(
     if lockfile_only:
         installer.lock()
 
-    installer.whitelist([d.name for d in all_dependencies])
+    installer.whitelist(dependency_names)
 
     last_line: str = ""
 
@@ -196,6 +200,28 @@ def drop_upper_bound_from_version_range(constraint: VersionRange) -> VersionRang
     return VersionRange(constraint.min, max=None, include_min=constraint.include_min)
 
 
+def _split_and_constraints(constraints: str) -> List[str]:
+    """
+    Split a constraint string into single _and_ constraints, retaining the
+    separators at the odd indices as `re.split` does with a capture group.
+
+    Comma separated constraints without spaces can be split directly; anything else
+    falls back to the separator regex which guards against splitting adjacent to
+    operators and hyphenated ranges.
+    """
+    if " " not in constraints:
+        parts = constraints.split(",")
+        if all(
+            part and part[0] not in "~=><,-" and part[-1] not in "~=><,-"
+            for part in parts
+        ):
+            split = [piece for part in parts for piece in (part, ",")]
+            split.pop()  # Drop the trailing separator
+            return split
+
+    return AND_CONSTRAINT_SEPARATORS.split(constraints)
+
+
 def mutate_constraint(constraints: str, callback: Callable[[str], str]) -> str:
     """
     Given a string of constraints, parse into single constraints, replace each one with
@@ -212,27 +238,62 @@ def mutate_constraint(constraints: str, callback: Callable[[str], str]) -> str:
     if constraints == "*":
         return callback(constraints)
 
-    # Parse _or_ expressions first
-    or_constraints = re.split(OR_CONSTRAINT_SEPARATORS, constraints.strip())
-
-    # Note a capture group was used so re.split returns the captured separators as well
-    # We need to retain these for joining the string after callbacks are performed
-    # It's easiest to just mutate the lists rather than performing fancy zips
-    for i in range(0, len(or_constraints), 2):
-        # Parse _and_ expressions
-        and_constraints = re.split(
-            AND_CONSTRAINT_SEPARATORS,
-            # Trailing `,` allowed but not retained — following Poetry internals
-            or_constraints[i].rstrip(",").strip(),
-        )
+    # The vast majority of constraints are a single token e.g. "^1.2.3"; if no
+    # separator characters are present there is nothing to split and the regular
+    # expressions can be skipped entirely
+    stripped = constraints.strip()
+    if "|" not in stripped and "," not in stripped and " " not in stripped:
+        return callback(stripped)
+
+    # Without an _or_ expression the string is a single _and_ expression and the
+    # cheaper comma split can be used directly
+    if "|" not in stripped:
+        # Trailing `,` allowed but not retained — following Poetry internals
+        and_constraints = _split_and_constraints(stripped.rstrip(",").strip())
 
         # If there are no _and_ expressions, this will still be called once
         for j in range(0, len(and_constraints), 2):
             and_constraints[j] = callback(and_constraints[j])
 
-        or_constraints[i] = "".join(and_constraints)
+        return "".join(and_constraints)
+
+    # Otherwise walk the string once with the combined separator pattern, applying
+    # the callback to each constraint and re-emitting the separators verbatim
+    result: List[str] = []
+    position = 0
+    previous_and: Optional[str] = None  # And-separator preceding the current token
+
+    for match in CONSTRAINT_SEPARATORS.finditer(stripped):
+        token = stripped[position : match.start()]
+        position = match.end()
+
+        if match.lastgroup == "or":
+            if previous_and is not None and not token:
+                # A trailing `,` before an _or_ expression is allowed but not
+                # retained — keep only the whitespace that followed it
+                result.append(previous_and.split(",", 1)[1])
+            else:
+                if previous_and is not None:
+                    result.append(previous_and)
+                # Trailing `,` allowed but not retained
+                result.append(callback(token.rstrip(",").strip()))
+            previous_and = None
+        else:
+            if previous_and is not None:
+                result.append(previous_and)
+            result.append(callback(token))
+            previous_and = match.group()
+            continue
+
+        result.append(match.group())
+
+    # Emit the final token; and-separators never match at the end of the string so
+    # a pending separator always has a token following it
+    if previous_and is not None:
+        result.append(previous_and)
+    result.append(callback(stripped[position:].rstrip(",").strip()))
 
-    return "".join(or_constraints)
+    return "".join(result)
 
 
 def drop_upper_bound_from_caret_constraint(constraint: str) -> str:
@@ -241,29 +302,37 @@ def drop_upper_bound_from_caret_constraint(constraint: str) -> str:
 
     If the constraint is not a caret constraint, it will be returned unchanged.
     """
-    if constraint.startswith("^"):
-        return constraint.replace("^", ">=", 1)
+    # A slice and concatenation avoids scanning the string twice with
+    # `startswith` followed by `replace`
+    if constraint[:1] == "^":
+        return ">=" + constraint[1:]
     else:
         return constraint
 
 
+@functools.lru_cache(maxsize=512)
+def _drop_caret_bounds_from_constraint(constraints: str) -> str:
+    """
+    Drop caret upper bounds from each constraint in a constraint string.
+
+    Memoized since the same constraint string is often repeated across groups and
+    the transformation is a pure function of the string.
+    """
+    return mutate_constraint(constraints, drop_upper_bound_from_caret_constraint)
+
+
 def drop_caret_bound_from_dependency(dependency: "Dependency") -> "Dependency":
     """
     Generate a new dependency with no upper bound from an existing dependency.
 
     If the dependency does not use a caret constraint to specify its upper bound,
-    it will not be changed but a new copy will be returned.
+    it will be returned unchanged.
     """
-    # If the constraint is empty, there is nothing to do
-    if not dependency.pretty_constraint:
+    # If the constraint is empty or contains no caret, there is nothing to do
+    if not dependency.pretty_constraint or "^" not in dependency.pretty_constraint:
         return dependency
 
-    new_version = mutate_constraint(
-        dependency.pretty_constraint, drop_upper_bound_from_caret_constraint
-    )
-
-    # Copy the existing dependency to retain as much information as possible
-    new_dependency = copy(dependency)
+    new_version = _drop_caret_bounds_from_constraint(dependency.pretty_constraint)
 
     # If the constraint is empty, assignment will fail
     if not new_version:
@@ -271,6 +340,14 @@ def drop_caret_bound_from_dependency(dependency: "Dependency") -> "Dependency":
             f"Updating constraint for {dependency} resulted in an empty version"
         )
 
+    # If the constraint did not change, skip the copy and constraint re-parse;
+    # callers can rely on an identity check to detect unchanged dependencies
+    if new_version == dependency.pretty_constraint:
+        return dependency
+
+    # Copy the existing dependency to retain as much information as possible
+    new_dependency = copy(dependency)
+
     # Update the constraint to the new version
     # The property setter parses this into a proper constraint type
     new_dependency.constraint = new_version  # type: ignore
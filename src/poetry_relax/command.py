@@ -1,5 +1,5 @@
 from collections import defaultdict
-from typing import Any, Dict, List, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Set
 
 # cleo is not PEP 561 compliant must be ignored
 # See https://github.com/python-poetry/cleo/pull/254
@@ -20,11 +20,41 @@ from poetry_relax._core import (
     update_dependency_config,
 )
 
+if TYPE_CHECKING:
+    from poetry.core.factory import DependencyConfig
+
 
 def _pretty_group(group: str) -> str:
     return f" in group <c1>{group!r}</c1>"
 
 
+class _UpdatedDependency:
+    """
+    Pairing of a dependency's original constraint string with its relaxed
+    replacement.
+
+    A slotted class avoids the tuple churn of building and unpacking
+    (constraint, dependency) pairs for every updated dependency.
+    """
+
+    __slots__ = ("old_constraint", "dependency")
+
+    def __init__(self, old_constraint: str, dependency: Dependency) -> None:
+        self.old_constraint = old_constraint
+        self.dependency = dependency
+
+
+def _constraint_has_caret(constraint: Any) -> bool:
+    """
+    Check if a dependency constraint contains a caret bound.
+
+    Constraints without a caret cannot be relaxed and do not need to be parsed.
+    """
+    if isinstance(constraint, dict):
+        constraint = constraint.get("version", "")
+    return isinstance(constraint, str) and "^" in constraint
+
+
 class RelaxCommand(InstallerCommand):
     """
     Implementation of `poetry relax`.
@@ -112,8 +142,15 @@ class RelaxCommand(InstallerCommand):
         # is based on the `poetry add` implementation which is available under the MIT
         # license.
 
+        # Snapshot options and verbosity once; cleo re-resolves these on every call
+        verbose = self.io.is_verbose()
+        dry_run = self.option("dry-run")
+        do_update = self.option("update")
+        do_check = self.option("check")
+        do_lock = self.option("lock")
+
         # Read poetry file as a dictionary
-        if self.io.is_verbose():
+        if verbose:
             self.line(f"Using poetry file at {self.poetry.file.path}")
         pyproject_config: dict[str, Any] = self.poetry.file.read()
         poetry_config = pyproject_config["tool"]["poetry"]
@@ -123,30 +160,39 @@ class RelaxCommand(InstallerCommand):
             {opt: (self.option(opt) or set()) for opt in {"only", "without", "group"}}
         )
 
+        # Hoisted out of the comprehension to avoid repeated option lookups and
+        # list scans per candidate group
+        without = set(self.option("without") or ())
+        selected_groups = self._get_only_group_option() or sorted(
+            # Use all groups by default, including optional groups
+            self.poetry.package.dependency_group_names(include_optional=True)
+        )
+
         groups = [
             str(group)
-            for group in (
-                self._get_only_group_option()
-                # Use all groups by default, including optional groups
-                or sorted(
-                    self.poetry.package.dependency_group_names(include_optional=True)
-                )
-            )
+            for group in selected_groups
             # Exclude groups specified by the `--without` option
-            if group not in self.option("without")
+            if group not in without
         ]
 
         if not groups:
             self.info("No groups to relax.")
             return 1
 
+        # Group display names are pure functions of the group name; format them
+        # once instead of per log line
+        pretty_groups = {group: _pretty_group(group) for group in groups}
+
         updated_dependencies: Dict[
-            str, List[Tuple[str, Dependency]]
+            str, List[_UpdatedDependency]
         ] = {}  # Dependencies updated per group
 
+        # Dependency configs per group, extracted once and reused at write-back
+        group_configs: Dict[str, "DependencyConfig"] = {}
+
         for group in groups:
             # Load dependencies in the given group
-            pretty_group = _pretty_group(group)
+            pretty_group = pretty_groups[group]
             self.info(
                 f"Checking dependencies{pretty_group} for relaxable constraints..."
             )
@@ -158,13 +204,16 @@ class RelaxCommand(InstallerCommand):
                 self.line(f"No dependencies found{pretty_group}.")
                 continue
 
-            # Parse the dependencies
+            group_configs[group] = dependency_config
+
+            # Parse the dependencies; constraints without a caret are skipped since
+            # they cannot be relaxed and parsing them is comparatively expensive
             target_dependencies = [
                 Factory.create_dependency(name, constraint)
                 for name, constraint in flattened_dependency_config_items(
                     dependency_config
                 )
-                if name != "python"
+                if name != "python" and _constraint_has_caret(constraint)
             ]
 
             if not target_dependencies:
@@ -172,7 +221,7 @@ class RelaxCommand(InstallerCommand):
                 updated_dependencies[group] = []
                 continue
 
-            if self.io.is_verbose():
+            if verbose:
                 self.line(
                     f"Found {len(target_dependencies)} dependencies{pretty_group}."
                 )
@@ -183,13 +232,15 @@ class RelaxCommand(InstallerCommand):
             ]
 
             updated_dependencies[group] = [
-                (old.pretty_constraint, new)
+                _UpdatedDependency(old.pretty_constraint, new)
                 for old, new in zip(target_dependencies, new_dependencies)
                 # We use the pretty constraint in updates to retain the user's string
-                if old.pretty_constraint != new.pretty_constraint
+                # Unchanged dependencies are returned by identity, so a pointer
+                # compare is sufficient here
+                if old is not new
             ]
 
-            if self.io.is_verbose():
+            if verbose:
                 self.line(
                     f"Proposing updates to {len(updated_dependencies[group])} "
                     f"dependencies{pretty_group}."
@@ -203,22 +254,21 @@ class RelaxCommand(InstallerCommand):
         self.line(f"Proposing updates to {updated_count} dependencies.")
 
         # Validate that the update is valid by running the installer
-        if self.option("update") or self.option("check") or self.option("lock"):
-            if self.io.is_verbose():
-                for group in groups:
-                    for old_constraint, dependency in updated_dependencies[group]:
+        if do_update or do_check or do_lock:
+            if verbose:
+                for group, dependencies in updated_dependencies.items():
+                    for update in dependencies:
+                        dependency = update.dependency
                         marker = (
                             f" (when {dependency.marker})" if dependency.marker else ""
                         )
                         self.info(
                             f"Proposing update for <c1>{dependency.name}</> constraint from "
-                            f"<c2>{old_constraint}</> to <c2>{dependency.pretty_constraint}</>"
-                            f"{marker}{_pretty_group(group)}"
+                            f"<c2>{update.old_constraint}</> to <c2>{dependency.pretty_constraint}</>"
+                            f"{marker}{pretty_groups[group]}"
                         )
 
-            should_not_update = self.option("dry-run") or not (
-                self.option("update") or self.option("lock")
-            )
+            should_not_update = dry_run or not (do_update or do_lock)
             if should_not_update:
                 self.info("Checking new dependencies can be solved...")
             else:
@@ -239,27 +289,27 @@ class RelaxCommand(InstallerCommand):
                 status = run_installer_update(
                     poetry=self.poetry,
                     installer=self.installer,
-                    lockfile_only=self.option("lock"),
+                    lockfile_only=do_lock,
                     dependencies_by_group={
-                        group: (d for _, d in deps)
-                        for group, deps in updated_dependencies.items()
+                        group: (update.dependency for update in updates)
+                        for group, updates in updated_dependencies.items()
                     },
                     poetry_config=poetry_config,
                     dry_run=should_not_update,
-                    verbose=self.io.is_verbose(),
+                    verbose=verbose,
                     silent=(
                         # Do not display installer output by default, it's confusing
-                        should_not_update and not self.io.is_verbose()
+                        should_not_update and not verbose
                     ),
                 )
             except Exception as exc:
                 self.line(str(exc), style="fg=red;options=bold")
                 status = 1
             else:
-                if self.option("check"):
+                if do_check:
                     self.line("\nDependency check successful.")
         else:
-            if not self.option("check"):
+            if not do_check:
                 self.info("Skipping check for valid versions.")
 
             status = 0
@@ -267,29 +317,27 @@ class RelaxCommand(InstallerCommand):
         # Cosmetic new line
         self.line("")
 
-        for group in groups:
-            dependency_config = extract_dependency_config_for_group(
-                group, poetry_config
-            )
-            if dependency_config is None:
-                continue
+        # Groups without a dependency config were never added to `group_configs`
+        # so no empty check is needed here
+        for group, group_config in group_configs.items():
+            for update in updated_dependencies[group]:
+                dependency = update.dependency
 
-            for old_constraint, dependency in updated_dependencies[group]:
                 # Mutate the dependency config (and consequently the pyproject config)
                 # (mypy complains because the type is not hinted as a mutable mapping)
-                dependency_config[dependency.name] = update_dependency_config(  # type: ignore
-                    dependency_config[dependency.name], dependency
+                group_config[dependency.name] = update_dependency_config(  # type: ignore
+                    group_config[dependency.name], dependency
                 )
 
                 # Display the final updates since they can be buried by the installer update
                 marker = f" (when {dependency.marker})" if dependency.marker else ""
                 self.info(
                     f"Updated <c1>{dependency.pretty_name}</> constraint from "
-                    f"<c2>{old_constraint}</> to <c2>{dependency.pretty_constraint}</>"
-                    f"{marker}{_pretty_group(group)}"
+                    f"<c2>{update.old_constraint}</> to <c2>{dependency.pretty_constraint}</>"
+                    f"{marker}{pretty_groups[group]}"
                 )
 
-        if status == 0 and not self.option("dry-run"):
+        if status == 0 and not dry_run:
             assert isinstance(pyproject_config, TOMLDocument)
             self.poetry.file.write(pyproject_config)
             self.info("Updated config file with relaxed constraints.")
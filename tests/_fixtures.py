@@ -1,6 +1,5 @@
 import os
 import shutil
-import subprocess
 import sys
 import tempfile
 from pathlib import Path
@@ -15,6 +14,48 @@ from poetry_relax._core import POETRY_VERSION
 
 from ._utilities import check_paths_relative, tmpchdir
 
+# Files that tests rewrite in place; hardlinking these would corrupt the shared
+# base project since writes truncate the existing inode rather than replacing it
+_COPY_ALWAYS_NAMES = {"pyproject.toml", "poetry.lock"}
+
+
+def _run_poetry_command(
+    poetry_application_factory: Callable[[], PoetryApplication],
+    command: str,
+    project_path: Path,
+) -> int:
+    """
+    Run a Poetry CLI command in-process against the project in the given directory.
+
+    Avoids paying interpreter startup and plugin discovery for a `poetry`
+    subprocess during session setup.
+    """
+    from cleo.io.inputs.string_input import StringInput
+
+    with tmpchdir(project_path):
+        application = poetry_application_factory()
+        application.auto_exits(False)
+        return application.run(StringInput(command))
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """
+    Copy a file by hardlink where possible.
+
+    Per-test project copies are dominated by the `.venv` contents; hardlinking
+    reduces the copy to one link per inode instead of duplicating every byte.
+    Falls back to a real copy for cross-device links and for files that tests
+    mutate in place.
+    """
+    if os.path.basename(src) in _COPY_ALWAYS_NAMES:
+        shutil.copy2(src, dst)
+        return
+
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
 
 @pytest.fixture(scope="session")
 def poetry_cache_directory() -> Path:
@@ -72,20 +113,15 @@ def base_poetry_project_path(
         # Create virtual environments in the temporary project
         os.environ["POETRY_VIRTUALENVS_IN_PROJECT"] = "true"
 
-        init_process = subprocess.run(
-            ["poetry", "init", "--no-interaction"],
-            cwd=tmpdir,
-            stderr=subprocess.PIPE,
-            stdout=sys.stdout,
+        status = _run_poetry_command(
+            # A plain application is used here since the configured factory reads
+            # the project config eagerly and the project does not exist yet
+            PoetryApplication,
+            "init --no-interaction",
+            Path(tmpdir),
         )
-
-        try:
-            init_process.check_returncode()
-        except subprocess.CalledProcessError as exc:
-            init_error = init_process.stderr.decode().strip()
-            raise RuntimeError(
-                f"Failed to initialize test project: {init_error}"
-            ) from exc
+        if status != 0:
+            raise RuntimeError(f"Failed to initialize test project: status {status}")
 
         # Hide that we are in a virtual environment already or Poetry will be refuse to
         # use one in the directory later
@@ -128,7 +164,7 @@ def poetry_project_path(base_poetry_project_path: Path, tmp_path: Path) -> Path:
     print(f"Creating test project at {project_path}")
 
     # Copy the initialized project into a clean temp directory
-    shutil.copytree(base_poetry_project_path, project_path)
+    shutil.copytree(base_poetry_project_path, project_path, copy_function=_link_or_copy)
 
     # Change the working directory for the duration of the test
     with tmpchdir(project_path):
@@ -138,6 +174,7 @@ def poetry_project_path(base_poetry_project_path: Path, tmp_path: Path) -> Path:
 @pytest.fixture(scope="session")
 def seeded_base_poetry_project_path(
     base_poetry_project_path: Path,
+    poetry_application_factory: Callable[[], PoetryApplication],
     seeded_cloudpickle_version,
     seeded_typing_extensions_version,
 ) -> Path:
@@ -150,53 +187,30 @@ def seeded_base_poetry_project_path(
         shutil.copytree(base_poetry_project_path, seeded_base, symlinks=True)
 
         print(f"Installing 'cloudpickle=={seeded_cloudpickle_version}'")
-        seed_process = subprocess.run(
-            [
-                "poetry",
-                "add",
-                f"cloudpickle=={seeded_cloudpickle_version}",
-                "importlib_metadata>=1.0",  # Needed for checking installed package versions
-                "--no-interaction",
-                "-v",
-            ],
-            cwd=seeded_base,
-            stderr=subprocess.PIPE,
-            stdout=sys.stdout,
-            env={**os.environ},
+        status = _run_poetry_command(
+            poetry_application_factory,
+            f"add cloudpickle=={seeded_cloudpickle_version}"
+            # `importlib_metadata` needed for checking installed package versions
+            " importlib_metadata>=1.0"
+            " --no-interaction -v",
+            seeded_base,
         )
-
-        try:
-            seed_process.check_returncode()
-        except subprocess.CalledProcessError as exc:
-            seed_error = seed_process.stderr.decode().strip()
-            raise RuntimeError(f"Failed to seed test project: {seed_error}") from exc
+        if status != 0:
+            raise RuntimeError(f"Failed to seed test project: status {status}")
 
         print()  # Poetry does not print newlines at the end of install
 
         print(
             f"Installing 'typing_extensions=={seeded_typing_extensions_version}' in group 'dev'"
         )
-        seed_process = subprocess.run(
-            [
-                "poetry",
-                "add",
-                f"typing_extensions=={seeded_typing_extensions_version}",
-                "--group",
-                "dev",
-                "--no-interaction",
-                "-v",
-            ],
-            cwd=seeded_base,
-            stderr=subprocess.PIPE,
-            stdout=sys.stdout,
-            env={**os.environ},
+        status = _run_poetry_command(
+            poetry_application_factory,
+            f"add typing_extensions=={seeded_typing_extensions_version}"
+            " --group dev --no-interaction -v",
+            seeded_base,
         )
-
-        try:
-            seed_process.check_returncode()
-        except subprocess.CalledProcessError as exc:
-            seed_error = seed_process.stderr.decode().strip()
-            raise RuntimeError(f"Failed to seed test project: {seed_error}") from exc
+        if status != 0:
+            raise RuntimeError(f"Failed to seed test project: status {status}")
 
         print()  # Poetry does not print newlines at the end of install
 
@@ -222,17 +236,30 @@ def seeded_poetry_project_path(
     print(f"Creating seeded test project at {project_path}")
 
     # Copy the initialized project into a clean temp directory
-    shutil.copytree(seeded_base_poetry_project_path, project_path, symlinks=True)
+    shutil.copytree(
+        seeded_base_poetry_project_path,
+        project_path,
+        symlinks=True,
+        copy_function=_link_or_copy,
+    )
 
     # Change the working directory for the duration of the test
     with tmpchdir(project_path):
         yield project_path
 
 
+# Whether the seeded venv's sanity check has run; the check spawns the venv's
+# interpreter and every per-test copy links back to the same session-scoped base,
+# so one check per session (per worker) is enough
+_seeded_venv_checked = False
+
+
 @pytest.fixture
 def seeded_project_venv(
     seeded_poetry_project_path: Path, poetry_application_factory: PoetryApplication
 ) -> VirtualEnv:
+    global _seeded_venv_checked
+
     if sys.platform == "win32":
         executable = seeded_poetry_project_path / ".venv" / "Scripts" / "python.exe"
     else:
@@ -255,7 +282,9 @@ def seeded_project_venv(
             {env.path}"
         """
 
-    # This will throw an exception if it fails
-    env.run_python_script("import cloudpickle")
+    if not _seeded_venv_checked:
+        # This will throw an exception if it fails
+        env.run_python_script("import cloudpickle")
+        _seeded_venv_checked = True
 
     yield env
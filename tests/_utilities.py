@@ -1,53 +1,107 @@
+import copy
 import os
-import sys
 from contextlib import contextmanager
 from functools import partial
 from pathlib import Path
-from typing import Any, Dict, Generator, Optional, Union
+from typing import TYPE_CHECKING, Any, Dict, Generator, Optional, Tuple, Union
 
-import tomlkit
-from cleo.commands.command import Command
-from cleo.io.outputs.output import Verbosity
+import tomli_w
+
+try:
+    import tomllib
+except ImportError:
+    # Python < 3.11
+    import tomli as tomllib
+
+# The tester base class and the `MAIN_GROUP` default must be available at module
+# level; the rest of the Poetry import graph is deferred to the call sites that
+# need it so collecting this module stays cheap
 from cleo.testers.command_tester import CommandTester as _CommandTester
-from poetry.console.application import Application as PoetryApplication
 from poetry.core.packages.dependency_group import MAIN_GROUP
-from poetry.utils.env import EnvManager
 
-from poetry_relax._core import PoetryConsoleError
+if TYPE_CHECKING:
+    from cleo.commands.command import Command
+    from cleo.io.outputs.output import Verbosity
+    from poetry.console.application import Application as PoetryApplication
 
 PYPROJECT = "pyproject.toml"
 LOCKFILE = "poetry.lock"
 
 
-def load_tomlfile(path: Union[str, Path] = "./") -> tomlkit.TOMLDocument:
-    return tomlkit.loads(Path(path).read_text())
+# Parsed TOML documents keyed by (path, mtime_ns, size); tests re-read the same
+# unchanged files repeatedly, e.g. on entry and exit of the matching assertions
+_toml_parse_cache: Dict[Tuple[str, int, int], Dict[str, Any]] = {}
+
+
+def load_tomlfile(
+    path: Union[str, Path] = "./", copy_result: bool = True
+) -> Dict[str, Any]:
+    # The much faster `tomllib` parser is used instead of the style-preserving
+    # `tomlkit` one; tests never depend on preserved formatting
+    path = Path(path)
+    stat = os.stat(path)
+    key = (os.fspath(path), stat.st_mtime_ns, stat.st_size)
+
+    document = _toml_parse_cache.get(key)
+    if document is None:
+        # Read in binary mode; `read_text` pays for a TextIOWrapper and per-read
+        # decoding that the parser does not need
+        with open(path, "rb") as file:
+            document = _toml_parse_cache[key] = tomllib.load(file)
+
+    # Callers may mutate the result so a copy of the cached document is returned
+    # by default; comparison-only callers can skip the copy
+    if not copy_result:
+        return document
+    return copy.deepcopy(document)
 
 
 @contextmanager
 def update_tomlfile(
     file: Union[str, Path],
-) -> Generator[tomlkit.TOMLDocument, None, None]:
+) -> Generator[Dict[str, Any], None, None]:
     """
     Updates a toml file by reading then yielding the existing contents for mutation.
+
+    The document is loaded through the parse cache as a plain dictionary and
+    written back with `tomli_w`; tests do not rely on the file's comments or
+    formatting surviving the round trip.
     """
     project_config = load_tomlfile(file)
     yield project_config
-    Path(file).write_text(tomlkit.dumps(project_config))
+    with open(file, "wb") as handle:
+        tomli_w.dump(project_config, handle)
+
+    # The mutation may affect env discovery so any cached env for the project
+    # is dropped
+    _env_cache.pop(Path(file).resolve(), None)
 
 
 @contextmanager
 def assert_tomlfile_matches(
     file: Union[str, Path],
-) -> Generator[tomlkit.TOMLDocument, None, None]:
+) -> Generator[Dict[str, Any], None, None]:
     """
     Asserts that the toml file in the given directory (defaults to current)
     is matches the yielded object after the duration of the context.
 
     Yields the initial contents of the file which can be mutated for comparison.
     """
+    before_bytes = Path(file).read_bytes()
     project_config = load_tomlfile(file)
+
+    # The pristine document lets the exit comparison skip re-reading the file
+    # when its bytes did not change; it is only compared against, never mutated,
+    # so the cached document can be used without a copy
+    pristine_config = load_tomlfile(file, copy_result=False)
+
     yield project_config
-    new_project_config = load_tomlfile(file)
+
+    if Path(file).read_bytes() == before_bytes:
+        new_project_config = pristine_config
+    else:
+        new_project_config = load_tomlfile(file, copy_result=False)
+
     assert project_config == new_project_config
 
 
@@ -82,6 +136,13 @@ def load_lockfile_packages() -> Dict[str, dict]:
 
 @contextmanager
 def tmpchdir(new_dir: Union[str, Path]) -> Generator[None, None, None]:
+    """
+    Temporarily change the working directory.
+
+    The change is process-global, which is safe under pytest-xdist since its
+    workers are separate processes; patching `os.getcwd` / `Path.cwd` instead
+    would miss the other ways Poetry resolves the project directory.
+    """
     pwd = os.getcwd()
     os.chdir(new_dir)
     try:
@@ -91,7 +152,7 @@ def tmpchdir(new_dir: Union[str, Path]) -> Generator[None, None, None]:
 
 
 def get_dependency_group(
-    tomlfile_config: tomlkit.TOMLDocument, group: str = MAIN_GROUP
+    tomlfile_config: Dict[str, Any], group: str = MAIN_GROUP
 ) -> Dict[str, str]:
     """
     Retrieve a dependency group from the poetry tool config in a tomlfile document.
@@ -103,61 +164,84 @@ def get_dependency_group(
     poetry_config = tomlfile_config["tool"]["poetry"]
 
     if group == MAIN_GROUP:
-        if "dependencies" not in poetry_config:
-            poetry_config["dependencies"] = tomlkit.table()
-
-        return poetry_config["dependencies"]
+        return poetry_config.setdefault("dependencies", {})
     else:
-        if "group" not in poetry_config:
-            poetry_config["group"] = tomlkit.table(is_super_table=True)
+        groups = poetry_config.setdefault("group", {})
+        return groups.setdefault(group, {}).setdefault("dependencies", {})
 
-        groups = poetry_config["group"]
-        if group not in groups:
-            dependencies_toml: dict[str, Any] = tomlkit.parse(
-                f"[tool.poetry.group.{group}.dependencies]\n\n"
-            )
-            group_table = dependencies_toml["tool"]["poetry"]["group"][group]
-            poetry_config["group"][group] = group_table
 
-        if "dependencies" not in poetry_config["group"][group]:
-            poetry_config["group"][group]["dependencies"] = tomlkit.table()
+def get_installed_version(venv, package: str) -> str:
+    """
+    Read the version of a package installed in the given virtual environment.
+
+    Reads the package's dist-info metadata directly instead of spawning the
+    environment's interpreter to import the package and print its version.
+    """
+    canonical_name = package.lower().replace("-", "_")
+
+    site_packages = Path(venv.site_packages.path)
+    for metadata_path in site_packages.glob("*.dist-info/METADATA"):
+        # dist-info directories are named `{distribution}-{version}.dist-info`
+        distribution = metadata_path.parent.name.split("-")[0].lower()
+        if distribution != canonical_name:
+            continue
+
+        for line in metadata_path.read_text().splitlines():
+            if line.startswith("Version:"):
+                return line.split(":", 1)[1].strip()
 
-        return poetry_config["group"][group]["dependencies"]
+    raise ValueError(f"Package {package!r} is not installed in {venv.path}")
 
 
 def assert_io_contains(content: str, io) -> None:
-    output = io.fetch_output()
-    # Ensure the output can be retrieved again later
-    io.fetch_output = lambda: output
+    output = getattr(io, "_cached_output", None)
+    if output is None:
+        output = io._cached_output = io.fetch_output()
+        # Ensure the output can be retrieved again later
+        io.fetch_output = lambda: output
     assert content in output
 
 
-# Backport Path.is_relative_to from Python 3.9+ to older
+def check_paths_relative(self: Union[str, Path], other: Union[str, Path]) -> bool:
+    """
+    Check if the first path is equal to or contained within the second.
 
-if sys.version_info < (3, 9):
+    `os.path.commonpath` handles trailing and doubled separators that a plain
+    string prefix comparison would not, in a single C-level call instead of
+    `Path.is_relative_to`'s walk over path parts. Paths are compared as given —
+    no symlink or `..` resolution.
+    """
+    prefix = os.fspath(other)
+    try:
+        return os.path.commonpath([os.fspath(self), prefix]) == prefix
+    except ValueError:
+        # Raised for mixed absolute/relative paths, which cannot be related
+        return False
 
-    def check_paths_relative(self, *other):
-        try:
-            self.relative_to(*other)
-            return True
-        except ValueError:
-            return False
 
-else:
-    check_paths_relative = Path.is_relative_to
+# Resolved environments keyed by the project's pyproject path; env discovery with
+# `reload=True` stat-walks the project and is repeated for identical projects
+_env_cache: Dict[Path, Any] = {}
 
 
 class PoetryCommandTester(_CommandTester):
-    def __init__(self, command: Command, application: PoetryApplication) -> None:
+    def __init__(self, command: "Command", application: "PoetryApplication") -> None:
         super().__init__(command)
         self.configure_for_application(application)
 
-    def configure_for_application(self, application: PoetryApplication):
+    def configure_for_application(self, application: "PoetryApplication"):
+        from poetry.utils.env import EnvManager
+
         self._application = application
+        # Force a reload on the next execution for the new application
+        self._last_pyproject_mtime = None
         application.add(self.command)
 
-        manager = EnvManager(poetry=application.poetry)
-        env = manager.get(reload=True)
+        env_key = application.poetry.file.path
+        env = _env_cache.get(env_key)
+        if env is None:
+            manager = EnvManager(poetry=application.poetry)
+            env = _env_cache[env_key] = manager.get(reload=True)
 
         # The following is necessary to set up the command and is usually handled by
         # poetry.console.application.Application.__init__ on command dispatch. The
@@ -170,12 +254,20 @@ class PoetryCommandTester(_CommandTester):
         args: str = "",
         inputs: Optional[str] = None,
         interactive: Optional[bool] = None,
-        verbosity: Optional[Verbosity] = None,
+        verbosity: Optional["Verbosity"] = None,
         decorated: Optional[bool] = None,
         supports_utf8: bool = True,
     ) -> int:
-        # Reload the application to ensure that project changes are reflected
-        self._application.reset_poetry()
+        from poetry_relax._core import PoetryConsoleError
+
+        # Reload the application to ensure that project changes are reflected;
+        # skipped when the project file has not changed since the last run as
+        # the reload re-parses the full project config
+        pyproject_path = self._application.poetry.file.path
+        mtime = pyproject_path.stat().st_mtime_ns if pyproject_path.exists() else None
+        if mtime is None or mtime != self._last_pyproject_mtime:
+            self._application.reset_poetry()
+            self._last_pyproject_mtime = mtime
 
         try:
             return super().execute(
@@ -5,3 +5,27 @@ import pytest
 pytest.register_assert_rewrite("tests._utilities")
 
 from ._fixtures import *  # noqa
+
+# Fixtures that depend on the session-scoped seeded base project
+_SEEDED_FIXTURES = {
+    "seeded_poetry_project_path",
+    "seeded_relax_command",
+    "seeded_project_venv",
+}
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    # Expose phase reports on the item so fixtures can tell during teardown
+    # whether the test failed
+    outcome = yield
+    report = outcome.get_result()
+    setattr(item, f"rep_{report.when}", report)
+
+
+def pytest_collection_modifyitems(items):
+    # Keep tests that share the seeded base project on a single xdist worker so
+    # only one worker pays for seeding the project and its virtual environment
+    for item in items:
+        if _SEEDED_FIXTURES.intersection(getattr(item, "fixturenames", ())):
+            item.add_marker(pytest.mark.xdist_group("seeded-project"))